@@ -2,6 +2,7 @@
 Configuration management for the application.
 """
 import os
+from functools import cached_property
 from typing import Optional
 from pydantic_settings import BaseSettings
 
@@ -21,6 +22,12 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
     
+    # Password hashing settings (argon2id).
+    # Memory cost is in KiB; the minimums (1 / 8 / 1) are for tests only.
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 2
+    
     # Application settings
     PORT: int = 8000
     CORS_ORIGINS: str = "*"
@@ -28,12 +35,12 @@ class Settings(BaseSettings):
     # Environment
     ENV: str = "development"
     
-    @property
+    @cached_property
     def database_url(self) -> str:
         """Construct database URL from settings."""
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Convert CORS origins string to list."""
         if self.CORS_ORIGINS == "*":
@@ -1,17 +1,52 @@
 """
 Security utilities for password hashing and JWT token management.
 """
-import re
-from datetime import datetime, timedelta
+import hashlib
+import string
+import threading
+import time
+from datetime import timedelta
 from typing import Optional
 
-from jose import JWTError, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 import bcrypt
+import jwt
+from jwt.exceptions import PyJWTError
 
 from app.core.config import settings
 
-# Password validation regex
-PASSWORD_REGEX = re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).{8,}$")
+# Character classes for password validation
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_DIGITS = frozenset(string.digits)
+
+# JWT settings resolved once at import instead of on every sign/verify
+_SECRET = settings.JWT_SECRET.encode('utf-8')
+_ALG = settings.JWT_ALGORITHM
+_EXP_SECS = settings.JWT_EXPIRATION_HOURS * 3600
+
+# Password hasher for new hashes; legacy bcrypt hashes are still verified
+# and upgraded on the next successful login
+_password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# Cache of verified JWT payloads keyed by SHA-256 of the token.
+# Entries live for at most 30 seconds; the token's own "exp" claim is
+# re-checked on every hit so a cached token never outlives its expiry.
+_jwt_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_jwt_cache_lock = threading.Lock()
+
+# Cache of successful password verifications keyed by
+# SHA-256(plain | hash). Only matches are stored so wrong-password
+# attempts always pay the full KDF cost.
+_verify_cache: TTLCache = TTLCache(maxsize=2048, ttl=300)
+_verify_cache_lock = threading.Lock()
 
 
 class PasswordError(Exception):
@@ -19,9 +54,27 @@ class PasswordError(Exception):
     pass
 
 
+def _kdf(password: str) -> str:
+    """Derive an argon2id hash for a password."""
+    return _password_hasher.hash(password)
+
+
+def _kdf_verify(plain_password: str, hashed_password: str) -> bool:
+    """Check a password against an argon2id or legacy bcrypt hash."""
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        return bcrypt.checkpw(
+            plain_password.encode('utf-8'),
+            hashed_password.encode('utf-8')
+        )
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
 def hash_password(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using argon2id.
     
     Args:
         password: Plain text password
@@ -33,16 +86,15 @@ def hash_password(password: str) -> str:
         PasswordError: If password doesn't meet security requirements
     """
     validate_password(password)
-    # Use bcrypt directly to avoid passlib initialization issues
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return _kdf(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
     
+    Both argon2id hashes and legacy bcrypt ($2b$) hashes are accepted.
+    
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password
@@ -50,13 +102,46 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    key = hashlib.sha256(
+        plain_password.encode('utf-8') + b"|" + hashed_password.encode('utf-8')
+    ).digest()
+    
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            return True
+    
     try:
-        return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
-        )
+        matched = _kdf_verify(plain_password, hashed_password)
     except Exception:
         return False
+    
+    if matched:
+        with _verify_cache_lock:
+            _verify_cache[key] = True
+    return matched
+
+
+def rehash_if_needed(plain_password: str, hashed_password: str) -> Optional[str]:
+    """
+    Upgrade a verified password hash to the current argon2id parameters.
+    
+    Must only be called after verify_password succeeded.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Stored hash that matched the password
+        
+    Returns:
+        New hash if the stored one is legacy bcrypt or uses outdated
+        parameters, None otherwise
+    """
+    if not hashed_password.startswith(_BCRYPT_PREFIXES):
+        try:
+            if not _password_hasher.check_needs_rehash(hashed_password):
+                return None
+        except InvalidHashError:
+            return None
+    return _kdf(plain_password)
 
 
 def validate_password(password: str) -> None:
@@ -75,7 +160,13 @@ def validate_password(password: str) -> None:
     Raises:
         PasswordError: If password doesn't meet requirements
     """
-    if not PASSWORD_REGEX.match(password):
+    chars = set(password)
+    if (
+        len(password) < 8
+        or chars.isdisjoint(_LOWERCASE)
+        or chars.isdisjoint(_UPPERCASE)
+        or chars.isdisjoint(_DIGITS)
+    ):
         raise PasswordError(
             "Password must be at least 8 characters and contain uppercase, lowercase, and number"
         )
@@ -94,18 +185,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     """
     to_encode = data.copy()
     
+    # JWT numeric dates are POSIX seconds
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
+        expire = now + _EXP_SECS
     
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    to_encode["exp"] = expire
+    to_encode["iat"] = now
     
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM
-    )
+    encoded_jwt = jwt.encode(to_encode, _SECRET, algorithm=_ALG)
     
     return encoded_jwt
 
@@ -120,15 +210,26 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token data or None if invalid
     """
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(key)
+    if cached is not None and cached.get("exp", 0) > time.time():
+        return dict(cached)
+    
     try:
         payload = jwt.decode(
             token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
+            _SECRET,
+            algorithms=[_ALG],
             options={"verify_signature": True, "verify_exp": True}
         )
-        return payload
-    except JWTError as e:
+        # Only successfully verified tokens are cached; failures are
+        # always re-checked against the signature
+        with _jwt_cache_lock:
+            _jwt_cache[key] = payload
+        return dict(payload)
+    except PyJWTError as e:
         # Log the error for debugging (in production, remove this)
         import logging
         logging.getLogger(__name__).debug(f"JWT decode error: {e}")
@@ -2,7 +2,7 @@
 Authentication dependency for protected routes.
 """
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -16,13 +16,17 @@ security = HTTPBearer()
 
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """
     Dependency to get the current authenticated user.
     
+    Reuses the payload decoded by JWTDecodeMiddleware.
+    
     Args:
+        request: Incoming request
         credentials: HTTP Bearer credentials
         db: Database session
         
@@ -32,10 +36,11 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    token = credentials.credentials
-    
-    # Decode token
-    payload = decode_access_token(token)
+    # Decode token unless the middleware already did
+    if hasattr(request.state, "jwt_payload"):
+        payload = request.state.jwt_payload
+    else:
+        payload = decode_access_token(credentials.credentials)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,7 +48,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user ID from payload (sub is stored as string in python-jose)
+    # Get user ID from payload (sub is stored as a string per RFC 7519)
     user_id_str: Optional[str] = payload.get("sub")
     if user_id_str is None:
         raise HTTPException(
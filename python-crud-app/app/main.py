@@ -1,12 +1,18 @@
 """
 FastAPI application entry point.
 """
-from datetime import datetime
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from app.core.config import settings
 from app.core.database import init_db
+from app.middleware.auth import JWTDecodeMiddleware
 from app.middleware.ratelimit import RateLimiter, RateLimitMiddleware
 from app.routers import auth, users
 
@@ -14,13 +20,37 @@ from app.routers import auth, users
 # Initialize database
 init_db()
 
+# Interval in seconds between sweeps of stale rate-limit entries
+RATE_LIMIT_SWEEP_INTERVAL = 60
+
+
+async def _periodic_cleanup():
+    """Sweep stale clients from every rate limiter off the request path."""
+    while True:
+        await asyncio.sleep(RATE_LIMIT_SWEEP_INTERVAL)
+        for limiter in rate_limiters.values():
+            limiter.cleanup()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background rate-limit sweep for the lifetime of the app."""
+    sweep = asyncio.create_task(_periodic_cleanup())
+    try:
+        yield
+    finally:
+        sweep.cancel()
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Python CRUD API",
     description="A production-ready RESTful API with authentication and CRUD operations",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -32,6 +62,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# JWT decoding middleware (added before rate limiting so it runs inside it
+# and rate-limited requests are rejected without decoding the token)
+app.add_middleware(JWTDecodeMiddleware)
+
 # Rate limiting middleware
 rate_limiters = {
     "/api/auth/register": RateLimiter(requests=3, window=60),  # 3 requests per minute
@@ -41,38 +75,47 @@ rate_limiters = {
 
 app.add_middleware(RateLimitMiddleware, rate_limiters=rate_limiters)
 
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
 
 
+# Pre-serialized bodies for the static/near-static endpoints. A fresh
+# Response is still built per request since middleware mutates headers.
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to Python CRUD API",
+    "docs": "/docs",
+    "health": "/health"
+})
+_HEALTH_PREFIX = b'{"status":"healthy","time":"'
+_HEALTH_SUFFIX = b'"}'
+
+
 @app.get("/health")
-def health_check():
+async def health_check():
     """
     Health check endpoint.
     
     Returns:
         Health status and timestamp
     """
-    return {
-        "status": "healthy",
-        "time": datetime.utcnow().isoformat() + "Z"
-    }
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()).encode()
+    return Response(
+        content=_HEALTH_PREFIX + now + _HEALTH_SUFFIX,
+        media_type="application/json"
+    )
 
 
 @app.get("/")
-def root():
+async def root():
     """
     Root endpoint.
     
     Returns:
         Welcome message
     """
-    return {
-        "message": "Welcome to Python CRUD API",
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
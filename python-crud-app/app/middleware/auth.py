@@ -0,0 +1,42 @@
+"""
+JWT decoding middleware shared by all authenticated routes.
+"""
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.security import decode_access_token
+
+
+class JWTDecodeMiddleware:
+    """
+    Pure ASGI middleware that decodes the bearer token once per request.
+    
+    Written without BaseHTTPMiddleware so requests pay no extra task or
+    stream wrapping for it.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware.
+        
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Decode the Authorization bearer token and store the payload.
+        
+        The payload (or None if missing/invalid) is stored on
+        request.state.jwt_payload for get_current_user to reuse.
+        """
+        if scope["type"] == "http":
+            payload = None
+            authorization = Headers(scope=scope).get("authorization", "")
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() == "bearer" and token:
+                payload = decode_access_token(token)
+            scope.setdefault("state", {})["jwt_payload"] = payload
+        
+        await self.app(scope, receive, send)
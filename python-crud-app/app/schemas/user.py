@@ -2,13 +2,25 @@
 Pydantic schemas for request/response validation.
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, field_validator
-import re
+from typing import Annotated, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints, field_validator
+import string
 
 
-# Username validation regex
-USERNAME_REGEX = re.compile(r"^[a-zA-Z0-9_]{3,50}$")
+# Syntactic email check for login; full EmailStr validation is only
+# needed when new addresses are accepted
+LoginEmail = Annotated[
+    str,
+    StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254)
+]
+
+# Characters allowed in a username
+USERNAME_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+
+
+def _is_valid_username(username: str) -> bool:
+    """Check username is 3-50 letters, numbers, or underscores."""
+    return 3 <= len(username) <= 50 and USERNAME_CHARS.issuperset(username)
 
 
 class UserBase(BaseModel):
@@ -20,11 +32,17 @@ class UserBase(BaseModel):
     @classmethod
     def validate_username(cls, v: str) -> str:
         """Validate username format."""
-        if not USERNAME_REGEX.match(v):
+        if not _is_valid_username(v):
             raise ValueError(
                 "Username must be 3-50 characters and contain only letters, numbers, and underscores"
             )
         return v
+    
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        """Lowercase email so it is stored and matched in one form."""
+        return v.lower()
 
 
 class UserCreate(UserBase):
@@ -41,11 +59,17 @@ class UserUpdate(BaseModel):
     @classmethod
     def validate_username(cls, v: Optional[str]) -> Optional[str]:
         """Validate username format if provided."""
-        if v is not None and not USERNAME_REGEX.match(v):
+        if v is not None and not _is_valid_username(v):
             raise ValueError(
                 "Username must be 3-50 characters and contain only letters, numbers, and underscores"
             )
         return v
+    
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: Optional[str]) -> Optional[str]:
+        """Lowercase email if provided."""
+        return v.lower() if v is not None else v
 
 
 class UserResponse(UserBase):
@@ -54,14 +78,19 @@ class UserResponse(UserBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserLogin(BaseModel):
     """Schema for user login."""
-    email: EmailStr
+    email: LoginEmail
     password: str
+    
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        """Lowercase email to match the stored form."""
+        return v.lower()
 
 
 class Token(BaseModel):
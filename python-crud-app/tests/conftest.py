@@ -0,0 +1,96 @@
+"""
+Shared pytest fixtures.
+"""
+import hashlib
+import os
+from functools import lru_cache
+
+import pytest
+
+
+# Use the minimum argon2 cost for the whole suite. This must run before any
+# test module imports app.core.security, which reads the settings at import.
+# Tests check the wrapper's behaviour, not KDF strength.
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "8")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
+
+# Set FAST_KDF=1 to replace the password KDF with a cheap stub. Nightly CI
+# should leave it unset so the real argon2/bcrypt paths are exercised.
+FAST_KDF = os.environ.get("FAST_KDF") == "1"
+
+# Set CACHE_KDF=1 to memoize hashes of identical passwords across the
+# session. A cached hash still verifies; only salt uniqueness is lost, so
+# tests relying on it should be marked no_hash_cache.
+CACHE_KDF = os.environ.get("CACHE_KDF") == "1"
+
+_STUB_PREFIX = "$stub$"
+
+# Real KDF functions, captured before they are stubbed
+_real_kdfs = {}
+
+# KDF in effect before the session-wide hash cache was applied
+_uncached_kdf = {}
+
+
+def _stub_kdf(password: str) -> str:
+    """Cheap deterministic stand-in for the argon2 KDF."""
+    return _STUB_PREFIX + hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def _stub_kdf_verify(plain_password: str, hashed_password: str) -> bool:
+    """Check stub hashes directly and defer anything else to the real KDF."""
+    if hashed_password.startswith(_STUB_PREFIX):
+        return hashed_password == _stub_kdf(plain_password)
+    return _real_kdfs["_kdf_verify"](plain_password, hashed_password)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_kdf():
+    """Stub out the KDF for the whole session when FAST_KDF=1."""
+    if not FAST_KDF:
+        yield
+        return
+    
+    # Imported lazily so test modules can configure settings first
+    from app.core import security
+    _real_kdfs["_kdf"] = security._kdf
+    _real_kdfs["_kdf_verify"] = security._kdf_verify
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "_kdf", _stub_kdf)
+        mp.setattr(security, "_kdf_verify", _stub_kdf_verify)
+        yield
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _hash_cache(_fast_kdf):
+    """Memoize the KDF for the whole session when CACHE_KDF=1."""
+    if not CACHE_KDF:
+        yield
+        return
+    
+    from app.core import security
+    _uncached_kdf["_kdf"] = security._kdf
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "_kdf", lru_cache(maxsize=256)(security._kdf))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _no_hash_cache(request, monkeypatch):
+    """Bypass the session hash cache for tests marked no_hash_cache."""
+    if CACHE_KDF and request.node.get_closest_marker("no_hash_cache"):
+        from app.core import security
+        monkeypatch.setattr(security, "_kdf", _uncached_kdf["_kdf"])
+
+
+@pytest.fixture(autouse=True)
+def _real_kdf(request, monkeypatch, _no_hash_cache):
+    """Restore the real KDF for tests marked real_kdf."""
+    # Runs after _no_hash_cache so the stub it restores is replaced too
+    if FAST_KDF and request.node.get_closest_marker("real_kdf"):
+        from app.core import security
+        for name, func in _real_kdfs.items():
+            monkeypatch.setattr(security, name, func)
@@ -1,12 +1,16 @@
 """
 Tests for authentication endpoints.
 """
+from datetime import datetime
+from unittest.mock import Mock
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.main import app
+from app.main import app, rate_limiters
+from app.core import security
 from app.core.database import Base, get_db
 from app.models.user import User
 
@@ -37,14 +41,25 @@ app.dependency_overrides[get_db] = override_get_db
 client = TestClient(app)
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def setup_database():
-    """Setup and teardown test database."""
+    """Create the test schema once per module and drop it afterwards."""
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Empty all tables and rate-limit counters between tests."""
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    for limiter in rate_limiters.values():
+        limiter.clients.clear()
+
+
 class TestRegistration:
     """Test user registration."""
     
@@ -181,3 +196,125 @@ class TestLogin:
         )
         
         assert response.status_code == 401
+    
+    def test_login_invalid_email(self):
+        """Test login with malformed email."""
+        response = client.post(
+            "/api/auth/login",
+            json={
+                "email": "invalid-email",
+                "password": "TestPass123"
+            }
+        )
+        
+        assert response.status_code == 422
+
+
+def register_and_get_token() -> str:
+    """Register the standard test user and return its token."""
+    response = client.post(
+        "/api/auth/register",
+        json={
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "TestPass123"
+        }
+    )
+    assert response.status_code == 201
+    return response.json()["token"]
+
+
+class TestCurrentUser:
+    """Test authenticated access via the bearer token."""
+    
+    def test_me_with_valid_token(self):
+        """Test fetching the current user with a valid token."""
+        token = register_and_get_token()
+        
+        response = client.get(
+            "/api/users/me",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["email"] == "test@example.com"
+    
+    def test_me_with_invalid_token(self):
+        """Test fetching the current user with a garbage token."""
+        response = client.get(
+            "/api/users/me",
+            headers={"Authorization": "Bearer garbage"}
+        )
+        
+        assert response.status_code == 401
+    
+    def test_token_decoded_once_per_request(self, monkeypatch):
+        """Test the middleware decodes the token and the dependency reuses it."""
+        token = register_and_get_token()
+        middleware_decode = Mock(wraps=security.decode_access_token)
+        dependency_decode = Mock(wraps=security.decode_access_token)
+        monkeypatch.setattr("app.middleware.auth.decode_access_token", middleware_decode)
+        monkeypatch.setattr("app.dependencies.auth.decode_access_token", dependency_decode)
+        
+        response = client.get(
+            "/api/users/me",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 200
+        assert middleware_decode.call_count == 1
+        assert dependency_decode.call_count == 0
+
+
+class TestUsers:
+    """Test the user CRUD endpoints."""
+    
+    def test_update_user(self):
+        """Test updating one's own profile returns the new values."""
+        token = register_and_get_token()
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = client.get("/api/users/me", headers=headers).json()["id"]
+        
+        # Backdate the timestamps so the update is visibly later
+        past = datetime(2000, 1, 1)
+        with engine.begin() as conn:
+            conn.execute(
+                User.__table__.update().values(created_at=past, updated_at=past)
+            )
+        
+        response = client.put(
+            f"/api/users/{user_id}",
+            headers=headers,
+            json={"username": "renamed", "email": "Renamed@Example.com"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["username"] == "renamed"
+        assert data["email"] == "renamed@example.com"
+        created_at = datetime.fromisoformat(data["created_at"])
+        assert created_at == past
+        assert datetime.fromisoformat(data["updated_at"]) > created_at
+    
+    def test_get_all_users_excludes_caller(self):
+        """Test listing users omits the caller and password hashes."""
+        token = register_and_get_token()
+        client.post(
+            "/api/auth/register",
+            json={
+                "username": "otheruser",
+                "email": "other@example.com",
+                "password": "TestPass123"
+            }
+        )
+        
+        response = client.get(
+            "/api/users",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 1
+        assert [user["username"] for user in data["users"]] == ["otheruser"]
+        assert "password_hash" not in data["users"][0]
@@ -0,0 +1,75 @@
+"""
+Tests for the in-memory rate limiter.
+"""
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.middleware.ratelimit import RateLimiter
+
+
+class TestRateLimiter:
+    """Test rate limiter behaviour."""
+    
+    def test_allows_up_to_limit(self):
+        """Test requests are allowed until the limit is reached."""
+        limiter = RateLimiter(requests=3, window=60)
+        
+        assert all(limiter.is_allowed("client") for _ in range(3))
+        assert limiter.is_allowed("client") is False
+    
+    def test_clients_are_independent(self):
+        """Test each client has its own budget."""
+        limiter = RateLimiter(requests=1, window=60)
+        
+        assert limiter.is_allowed("a") is True
+        assert limiter.is_allowed("b") is True
+        assert limiter.is_allowed("a") is False
+    
+    def test_window_expiry(self, monkeypatch):
+        """Test requests are allowed again once the window has passed."""
+        now = [1000.0]
+        monkeypatch.setattr("app.middleware.ratelimit.time.time", lambda: now[0])
+        limiter = RateLimiter(requests=1, window=60)
+        
+        assert limiter.is_allowed("client") is True
+        assert limiter.is_allowed("client") is False
+        
+        now[0] += 60
+        assert limiter.is_allowed("client") is True
+    
+    def test_cleanup_removes_stale_clients(self, monkeypatch):
+        """Test cleanup drops clients with no requests in the window."""
+        now = [1000.0]
+        monkeypatch.setattr("app.middleware.ratelimit.time.time", lambda: now[0])
+        limiter = RateLimiter(requests=5, window=60)
+        limiter.is_allowed("client")
+        
+        now[0] += 120
+        limiter.cleanup()
+        
+        assert "client" not in limiter.clients
+
+
+class TestPeriodicCleanup:
+    """Test the background rate-limit sweep."""
+    
+    def test_periodic_cleanup_sweeps_every_limiter(self, monkeypatch):
+        """Test each sweep calls cleanup on every rate limiter."""
+        # Imported here so the limiter tests above do not need the app
+        from app import main
+        monkeypatch.setattr(main, "RATE_LIMIT_SWEEP_INTERVAL", 0)
+        cleanups = []
+        for limiter in main.rate_limiters.values():
+            cleanup = Mock()
+            monkeypatch.setattr(limiter, "cleanup", cleanup)
+            cleanups.append(cleanup)
+        
+        async def sweep_briefly():
+            await asyncio.wait_for(main._periodic_cleanup(), timeout=0.01)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(sweep_briefly())
+        
+        assert all(cleanup.called for cleanup in cleanups)
@@ -1,12 +1,21 @@
 """
 Tests for security utilities (password hashing and JWT).
 """
+import hashlib
+
+import bcrypt
+import jwt
 import pytest
+from cachetools import TTLCache
 from datetime import timedelta
+from unittest.mock import Mock
 
+from app.core import security
+from app.core.config import settings
 from app.core.security import (
     hash_password,
     verify_password,
+    rehash_if_needed,
     validate_password,
     create_access_token,
     decode_access_token,
@@ -14,99 +23,170 @@ from app.core.security import (
 )
 
 
+STD_PASSWORD = "TestPassword123"
+
+
+def assert_invalid_passwords(passwords):
+    """Assert validate_password rejects every password, reporting any accepted."""
+    accepted = []
+    for password in passwords:
+        try:
+            validate_password(password)
+        except PasswordError:
+            continue
+        accepted.append(password)
+    assert not accepted, f"Weak passwords accepted: {accepted}"
+
+
+@pytest.fixture(scope="module")
+def std_hash():
+    """Hash STD_PASSWORD once for the whole module."""
+    return hash_password(STD_PASSWORD)
+
+
+@pytest.fixture(scope="module")
+def std_token():
+    """Sign one access token for the whole module."""
+    return create_access_token({"sub": "1"})
+
+
+@pytest.fixture
+def empty_jwt_cache(monkeypatch):
+    """Replace the JWT cache with an empty one."""
+    cache = TTLCache(maxsize=10000, ttl=30)
+    monkeypatch.setattr(security, "_jwt_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def counting_jwt_decode(monkeypatch):
+    """Spy on jwt.decode calls."""
+    decode = Mock(wraps=security.jwt.decode)
+    monkeypatch.setattr(security.jwt, "decode", decode)
+    return decode
+
+
+@pytest.fixture(scope="module")
+def expired_token():
+    """Sign a token whose exp/iat lie at the start of the epoch."""
+    return jwt.encode(
+        {"sub": "1", "exp": 1, "iat": 1},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM
+    )
+
+
 class TestPasswordHashing:
     """Test password hashing functionality."""
     
-    def test_hash_password_valid(self):
+    def test_hash_password_valid(self, std_hash):
         """Test hashing a valid password."""
-        password = "StrongPass123"
-        hashed = hash_password(password)
+        hashed = std_hash
         
         assert hashed is not None
-        assert hashed != password
+        assert hashed != STD_PASSWORD
         assert len(hashed) > 0
     
-    def test_hash_password_weak_too_short(self):
-        """Test hashing a password that's too short."""
-        with pytest.raises(PasswordError):
-            hash_password("Short1")
-    
-    def test_hash_password_weak_no_uppercase(self):
-        """Test hashing a password without uppercase."""
-        with pytest.raises(PasswordError):
-            hash_password("weakpass123")
-    
-    def test_hash_password_weak_no_lowercase(self):
-        """Test hashing a password without lowercase."""
-        with pytest.raises(PasswordError):
-            hash_password("WEAKPASS123")
-    
-    def test_hash_password_weak_no_number(self):
-        """Test hashing a password without number."""
+    @pytest.mark.real_kdf
+    @pytest.mark.no_hash_cache
+    def test_hash_password_salted(self):
+        """Test hashing the same password twice gives different hashes."""
+        first = hash_password(STD_PASSWORD)
+        second = hash_password(STD_PASSWORD)
+        
+        assert first != second
+        assert verify_password(STD_PASSWORD, first) is True
+        assert verify_password(STD_PASSWORD, second) is True
+    
+    @pytest.mark.parametrize(
+        "password",
+        ["Short1", "weakpass123", "WEAKPASS123", "WeakPassword"],
+        ids=["too_short", "no_uppercase", "no_lowercase", "no_number"],
+    )
+    def test_hash_password_weak(self, password):
+        """Test hashing a password that fails validation."""
         with pytest.raises(PasswordError):
-            hash_password("WeakPassword")
+            hash_password(password)
     
-    def test_verify_password_correct(self):
+    def test_verify_password_correct(self, std_hash):
         """Test verifying correct password."""
-        password = "TestPassword123"
-        hashed = hash_password(password)
+        password = STD_PASSWORD
+        hashed = std_hash
         
         assert verify_password(password, hashed) is True
     
-    def test_verify_password_incorrect(self):
+    def test_verify_password_incorrect(self, std_hash):
         """Test verifying incorrect password."""
-        password = "TestPassword123"
-        hashed = hash_password(password)
+        hashed = std_hash
         
         assert verify_password("WrongPassword123", hashed) is False
     
-    def test_verify_password_empty(self):
+    def test_verify_password_repeated(self, std_hash, monkeypatch):
+        """Test a repeated match skips the KDF but mismatches never do."""
+        kdf_verify = Mock(wraps=security._kdf_verify)
+        monkeypatch.setattr(security, "_kdf_verify", kdf_verify)
+        monkeypatch.setattr(security, "_verify_cache", TTLCache(maxsize=2048, ttl=300))
+        
+        assert verify_password(STD_PASSWORD, std_hash) is True
+        assert verify_password(STD_PASSWORD, std_hash) is True
+        assert kdf_verify.call_count == 1
+        
+        kdf_verify.reset_mock()
+        assert verify_password("WrongPassword123", std_hash) is False
+        assert verify_password("WrongPassword123", std_hash) is False
+        assert kdf_verify.call_count == 2
+    
+    def test_verify_password_empty(self, std_hash):
         """Test verifying empty password."""
-        password = "TestPassword123"
-        hashed = hash_password(password)
+        hashed = std_hash
         
         assert verify_password("", hashed) is False
+    
+    @pytest.mark.real_kdf
+    def test_verify_password_legacy_bcrypt(self):
+        """Test verifying and upgrading a legacy bcrypt hash."""
+        password = STD_PASSWORD
+        legacy = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+        
+        assert verify_password(password, legacy) is True
+        assert verify_password("WrongPassword123", legacy) is False
+        
+        upgraded = rehash_if_needed(password, legacy)
+        assert upgraded is not None
+        assert upgraded.startswith("$argon2id$")
+        assert verify_password(password, upgraded) is True
+    
+    @pytest.mark.real_kdf
+    def test_rehash_not_needed_for_current_hash(self):
+        """Test current argon2id hashes are not rehashed."""
+        password = STD_PASSWORD
+        hashed = hash_password(password)
+        
+        assert hashed.startswith("$argon2id$")
+        assert rehash_if_needed(password, hashed) is None
 
 
 class TestPasswordValidation:
     """Test password validation."""
     
-    def test_validate_password_valid(self):
-        """Test validating a valid password."""
-        validate_password("ValidPass123")  # Should not raise
-    
-    def test_validate_password_complex(self):
-        """Test validating a complex password."""
-        validate_password("C0mpl3xP@ssw0rd!")  # Should not raise
-    
-    def test_validate_password_too_short(self):
-        """Test validating a password that's too short."""
-        with pytest.raises(PasswordError):
-            validate_password("Short1")
-    
-    def test_validate_password_no_uppercase(self):
-        """Test validating a password without uppercase."""
-        with pytest.raises(PasswordError):
-            validate_password("lowercase123")
-    
-    def test_validate_password_no_lowercase(self):
-        """Test validating a password without lowercase."""
-        with pytest.raises(PasswordError):
-            validate_password("UPPERCASE123")
+    def test_validate_password_accepts_strong(self):
+        """Test validating passwords that meet all requirements."""
+        for password in ("ValidPass123", "C0mpl3xP@ssw0rd!"):
+            validate_password(password)  # Should not raise
     
-    def test_validate_password_no_number(self):
-        """Test validating a password without number."""
-        with pytest.raises(PasswordError):
-            validate_password("NoNumberPass")
+    def test_validate_password_rejects_weak(self):
+        """Test validating passwords that each miss one requirement."""
+        assert_invalid_passwords(
+            ["Short1", "lowercase123", "UPPERCASE123", "NoNumberPass"]
+        )
 
 
 class TestJWT:
     """Test JWT token functionality."""
     
-    def test_create_access_token(self):
+    def test_create_access_token(self, std_token):
         """Test creating an access token."""
-        data = {"sub": 1}
-        token = create_access_token(data)
+        token = std_token
         
         assert token is not None
         assert isinstance(token, str)
@@ -120,18 +200,40 @@ class TestJWT:
         assert token is not None
         assert isinstance(token, str)
     
-    def test_decode_access_token_valid(self):
+    def test_decode_access_token_valid(self, std_token):
         """Test decoding a valid token."""
-        data = {"sub": 1}
-        token = create_access_token(data)
-        
-        decoded = decode_access_token(token)
+        decoded = decode_access_token(std_token)
         
         assert decoded is not None
-        assert decoded["sub"] == 1
+        assert decoded["sub"] == "1"
         assert "exp" in decoded
         assert "iat" in decoded
     
+    def test_decode_access_token_cached(
+        self, std_token, empty_jwt_cache, counting_jwt_decode
+    ):
+        """Test a repeated decode of the same token skips jwt.decode."""
+        first = decode_access_token(std_token)
+        second = decode_access_token(std_token)
+        
+        assert first is not None
+        assert first == second
+        assert first is not second
+        assert counting_jwt_decode.call_count == 1
+    
+    def test_decode_access_token_cached_expired(
+        self, std_token, empty_jwt_cache, counting_jwt_decode
+    ):
+        """Test a cached payload past its exp is decoded again."""
+        key = hashlib.sha256(std_token.encode("utf-8")).digest()
+        empty_jwt_cache[key] = {"sub": "1", "exp": 1}
+        
+        decoded = decode_access_token(std_token)
+        
+        assert counting_jwt_decode.call_count == 1
+        assert decoded is not None
+        assert decoded["exp"] > 1
+    
     def test_decode_access_token_invalid(self):
         """Test decoding an invalid token."""
         decoded = decode_access_token("invalid.token.here")
@@ -144,11 +246,8 @@ class TestJWT:
         
         assert decoded is None
     
-    def test_decode_access_token_expired(self):
+    def test_decode_access_token_expired(self, expired_token):
         """Test decoding an expired token."""
-        data = {"sub": 1}
-        token = create_access_token(data, expires_delta=timedelta(seconds=-1))
-        
-        decoded = decode_access_token(token)
+        decoded = decode_access_token(expired_token)
         
         assert decoded is None